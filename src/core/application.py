@@ -16,6 +16,8 @@ from modules.tools.mcp_module import MCPModule
 from modules.tools.tools_module import ToolsModule
 from modules.tts.tts_module import TTSModule
 from modules.whisper.whisper_module import WhisperModule
+from prompts.prompts import preload_prompts
+from services.llm_client import LLMClient
 from services.websocket_server import WebSocketServer
 
 logger = logging.getLogger(__name__)
@@ -38,8 +40,11 @@ class Application:
     def _setup_modules(self):
         """Instantiate and register all modules"""
 
+        # one client (and connection pool) for everything talking to the main llm provider
+        llm_client = LLMClient(self.config.get("llm"))
+
         # register the rest as they dont depend on anything above
-        brain_module = BrainModule(self.event_bus, self.module_manager, self.config.raw)
+        brain_module = BrainModule(self.event_bus, self.module_manager, self.config.raw, llm_client=llm_client)
         self.module_manager.register(brain_module)
         
         modules = [
@@ -72,7 +77,8 @@ class Application:
             config=self.config.raw,
             discord_module=discord_module,
             voice_manager=discord_module.voice_manager,
-            brain_module=brain_module
+            brain_module=brain_module,
+            llm_client=llm_client,
         )
 
         self.module_manager.register(tools_module)
@@ -102,6 +108,9 @@ class Application:
         # Setup signal handlers
         self._setup_signal_handlers()
 
+        # prompts never change at runtime, read them all up front
+        await asyncio.to_thread(preload_prompts)
+
         # Setup modules
         self._setup_modules()
         await self.module_manager.initialize_all()
@@ -5,10 +5,11 @@ from datetime import datetime
 from .types import EventType, EventPriority
 
 
-@dataclass(order=True)
+@dataclass(order=True, slots=True, frozen=True)
 class Event:
     """
     Base event class for the Kleeborp event system.
+    Immutable once created, handlers share the same instance.
     """
 
     type: EventType
@@ -20,15 +21,13 @@ class Event:
 
     def __post_init__(self):
         # Auto-generate ID if not provided
+        # frozen, so go through object.__setattr__
         if self.id is None:
-            self.id = f"{self.type.value}_{self.timestamp.timestamp()}"
-
-        # Convert EventType to its value if needed
-        if isinstance(self.type, EventType):
-            self.type = self.type
-        elif isinstance(self.type, str):
-            # Allow string fallback for dynamic events
-            self.type = self.type
+            object.__setattr__(
+                self, "id", f"{self.type.value}_{self.timestamp.timestamp()}"
+            )
+
+        # type is left as is, EventType or a plain string for dynamic events
 
     def to_dict(self) -> dict:
         """Convert event to dictionary for serialization"""
@@ -49,6 +49,7 @@ class EventType(str, Enum):
 
     # === Speech Events ===
     TRANSCRIPTION_REQUEST = "speech.transcription.request"
+    TRANSCRIPTION_PARTIAL = "speech.transcription.partial"
     TRANSCRIPTION_COMPLETE = "speech.transcription.complete"
     TTS_REQUEST = "tts.request"
     TTS_CANCELLED = "tts.cancelled"
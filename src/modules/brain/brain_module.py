@@ -14,11 +14,11 @@ from utils.user_name_to_name import user_name_to_name
 logger = logging.getLogger(__name__)
 
 class BrainModule(BaseModule):
-    def __init__(self, event_bus, module_manager, config):
+    def __init__(self, event_bus, module_manager, config, llm_client: LLMClient = None):
         super().__init__("brain", event_bus, config)
 
         self.module_manager = module_manager
-        self.llm_client = LLMClient(config["llm"])
+        self.llm_client = llm_client or LLMClient(config["llm"])
         self.tool_results = []
 
         self.last_tools_used = [] # used to try and prevent loops, if a new tool was requested whilst we're giving back previous tool data, and its in here, we discard the new tool request
@@ -297,6 +297,10 @@ class BrainModule(BaseModule):
             self.logger.error(e, exc_info=True)
             raise e
 
+    def get_recent_user_messages(self, n: int = 10) -> list:
+        """Most recent pending user messages, already in LLM message format"""
+        return self.pending_conversation_buffer[-n:]
+
     async def _get_system_prompt(self) -> str:
         """Build system prompt from module fragments"""
         # Get from module manager
@@ -7,6 +7,50 @@ from modules.memory.rag_database import RAGDatabase
 from prompts.prompts import load_prompt
 from services.llm_client import LLMClient
 
+ASSISTANT_PREFIX = "assistant: "
+MEMORIES_PROMPT = "Relevant Memories to current conversation:\n"
+
+MEMORY_TOOL_SCHEMA = [{
+  "type": "function",
+  "function": {
+    "name": "create_memories",
+    "description": "Store extracted memories into the RAG memory store",
+    "parameters": {
+      "type": "object",
+      "properties": {
+        "memories": {
+          "type": "array",
+          "items": {
+            "type": "object",
+            "properties": {
+              "question": { "type": "string" },
+              "answer": { "type": "string" },
+              "type": { "type": "string" },
+              "entities": {
+                "type": "array",
+                "items": { "type": "string" }
+              },
+              "confidence": {
+                "type": "number",
+                "minimum": 0,
+                "maximum": 1
+              }
+            },
+            "required": [
+              "question",
+              "answer",
+              "type",
+              "entities",
+              "confidence"
+            ]
+          }
+        }
+      },
+      "required": ["memories"]
+    }
+  }
+}]
+
 
 class MemoryModule(BaseModule):
     def __init__(self, event_bus, module_manager, config=None):
@@ -17,6 +61,7 @@ class MemoryModule(BaseModule):
 
         self.previous_conversations = []
         self.current_processed_memories = 0
+        self._extract_task: asyncio.Task | None = None
         
         self.to_commit_messages = []
 
@@ -24,18 +69,21 @@ class MemoryModule(BaseModule):
         self.config = config["modules"]["memory"]
 
         self.current_relevant_memories = []
+        self._prompt_fragment = MEMORIES_PROMPT
 
     # TODO: Maybe listen on USER_INPUT as we may move the transcription_complete to some other place
     @event_handler(EventType.USER_INPUT)
     async def on_transcription_complete(self, event: Event):
         # dont commit to the messages this turn as brain module does that
-        self.to_commit_messages.append(f'{event.data["message"]["content"]}')
+        self.to_commit_messages.append(event.data["message"]["content"])
 
         raw_transcript = event.data["message"]["content"].split(":")[1].strip()
 
         self.current_relevant_memories = await self.rag.query_relevant_entries(
             raw_transcript
         )
+        # built once here rather than every time the prompt gets built
+        self._prompt_fragment = MEMORIES_PROMPT + "\n".join(self.current_relevant_memories)
 
     @event_handler(EventType.LLM_GENERATION_COMPLETE)
     async def on_llm_generation_complete(self, event: Event):
@@ -45,17 +93,13 @@ class MemoryModule(BaseModule):
 
         self.to_commit_messages.clear()
 
-        self.previous_conversations.append(f'assistant: {event.data['message']}')
+        self.previous_conversations.append(ASSISTANT_PREFIX + event.data["message"])
 
     async def get_prompt_fragment(self):
-        prompt = "Previous conversation history DO NOT OUTPUT THIS:\n"
-
         # conversation = '\n'.join(self.previous_conversations[-50:])
+        # return f"Previous conversation history DO NOT OUTPUT THIS:\n{conversation}\n\nRelevant Memories:\n{memories}"
 
-        memories = "\n".join(self.current_relevant_memories)
-
-        # return f"{prompt}{conversation}\n\nRelevant Memories:\n{memories}"
-        return f"Relevant Memories to current conversation:\n{memories}"
+        return self._prompt_fragment
 
     async def _run(self):
         try:
@@ -65,7 +109,10 @@ class MemoryModule(BaseModule):
                 
                 # here we're just checking we have 20 messages in our convo to parse into memories
                 if len(self.previous_conversations) - self.current_processed_memories >= 40:
-                    await self._create_memories_from_conversation()
+                    # run in the background so a slow extraction doesn't hold up this loop
+                    if self._extract_task is None or self._extract_task.done():
+                        self._extract_task = asyncio.create_task(self._create_memories_from_conversation())
+                        self._extract_task.add_done_callback(self._on_extract_done)
 
                 await asyncio.sleep(5)
         except asyncio.CancelledError:
@@ -79,69 +126,57 @@ class MemoryModule(BaseModule):
         await self.rag.initialize()
 
     async def _cleanup(self):
-        pass
+        if self._extract_task and not self._extract_task.done():
+            self._extract_task.cancel()
+
+        await self.rag.close()
+
+    def _on_extract_done(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+
+        if task.exception():
+            self.logger.error(f"memory extraction failed: {task.exception()}", exc_info=task.exception())
 
     # TODO Make it so it uses the MCP server to insert memories
     async def _create_memories_from_conversation(self):
         messages = copy.deepcopy(self.previous_conversations[-40:])
+        window_end = len(self.previous_conversations)
 
         if not messages:
             return
+
+        # skip the llm call if the window is mostly us talking
+        user_ratio = sum(1 for m in messages if not m.startswith(ASSISTANT_PREFIX)) / len(messages)
+
+        if user_ratio < 0.2:
+            self.logger.info('skipping memory creation, nothing new to remember in this window')
+            self.current_processed_memories = window_end
+            return
         
         self.logger.info('creating memories from previous 40 messages')
 
         system_prompt = await asyncio.to_thread(load_prompt, "memory")
 
         output_message = ""
+
+        # upserts run alongside the stream instead of holding it up, capped so we dont flood chroma
+        upsert_semaphore = asyncio.Semaphore(self.config.get("upsert_concurrency", 4))
+        upsert_tasks = []
+
+        async def upsert_memory(document: str, metadata: dict):
+            async with upsert_semaphore:
+                await self.rag.upsert(document=document, metadata=metadata)
         
         stream = self.llm_client.stream_completion(
             messages=[
                 {"role": "system", "content": system_prompt},
                 *(
                     {"role": "user", "content": content}
-                    for content in self.previous_conversations[-40:]
+                    for content in messages
                 ),
             ],
-        tools = [{
-          "type": "function",
-          "function": {
-            "name": "create_memories",
-            "description": "Store extracted memories into the RAG memory store",
-            "parameters": {
-              "type": "object",
-              "properties": {
-                "memories": {
-                  "type": "array",
-                  "items": {
-                    "type": "object",
-                    "properties": {
-                      "question": { "type": "string" },
-                      "answer": { "type": "string" },
-                      "type": { "type": "string" },
-                      "entities": {
-                        "type": "array",
-                        "items": { "type": "string" }
-                      },
-                      "confidence": {
-                        "type": "number",
-                        "minimum": 0,
-                        "maximum": 1
-                      }
-                    },
-                    "required": [
-                      "question",
-                      "answer",
-                      "type",
-                      "entities",
-                      "confidence"
-                    ]
-                  }
-                }
-              },
-              "required": ["memories"]
-            }
-          }
-        }]
+            tools=MEMORY_TOOL_SCHEMA,
         )
 
         async for chunk in stream:
@@ -173,14 +208,21 @@ class MemoryModule(BaseModule):
                     self.logger.warning(f"Skipping malformed memory: {mem}")
                     continue
 
-                await self.rag.upsert(
+                upsert_tasks.append(asyncio.create_task(upsert_memory(
                     document=answer,
                     metadata={
                         "question": question,
                         "type": mem_type,
                         "entities": ', '.join(mem.get("entities", [])),
                     },
-                )
-                
-        self.current_processed_memories = len(self.previous_conversations)
+                )))
+
+        results = await asyncio.gather(*upsert_tasks, return_exceptions=True)
+
+        # only mark the window handled once it went through, a failed stream gets retried
+        self.current_processed_memories = window_end
+
+        for result in results:
+            if isinstance(result, Exception):
+                self.logger.error(f"Failed to store memory: {result}", exc_info=result)
 
@@ -1,8 +1,12 @@
 import asyncio
+from collections import OrderedDict
+import hashlib
 import logging
 from uuid import uuid4
 import chromadb
 
+QUERY_CACHE_SIZE = 256
+
 
 class RAGDatabase:
     def __init__(self, config):
@@ -16,14 +20,52 @@ class RAGDatabase:
         self.collection: chromadb.Collection = None
         self.config = config
 
+        # transcripts repeat a lot (vad flapping), so remember recent answers until something is upserted
+        self._query_cache: OrderedDict[bytes, list[str]] = OrderedDict()
+        self._cache_epoch = 0
+
     async def initialize(self):
         self.collection = await asyncio.to_thread(self._create_if_not_exists_sync)
 
+    async def close(self):
+        self._query_cache.clear()
+
     async def query_relevant_entries(self, input: str) -> list[str]:
-        return await asyncio.to_thread(self._query_relevant_entries_sync, input)
+        normalized = " ".join(input.lower().split())
+        key = hashlib.blake2b(normalized.encode(), digest_size=8).digest()
+
+        cached = self._query_cache.get(key)
+        if cached is not None:
+            self._query_cache.move_to_end(key)
+            return cached
+
+        epoch = self._cache_epoch
+
+        documents = await asyncio.to_thread(self._query_relevant_entries_sync, input)
+
+        # an upsert landed while we were querying, this result might already be stale
+        if epoch == self._cache_epoch:
+            self._query_cache[key] = documents
+            if len(self._query_cache) > QUERY_CACHE_SIZE:
+                self._query_cache.popitem(last=False)
+
+        return documents
+
+    async def upsert(self, document: str, metadata: dict | None = None):
+        # chroma rejects empty metadata so fall back to something meaningful
+        metadata = metadata or {"type": "short-term"}
+
+        self._invalidate_cache()
+
+        try:
+            return await asyncio.to_thread(self._upsert_sync, document, metadata)
+        finally:
+            # again once the write landed, a query that overlapped it must not get cached
+            self._invalidate_cache()
 
-    async def upsert(self, document: str, metadata=dict):
-        return await asyncio.to_thread(self._upsert_sync, document, metadata)
+    def _invalidate_cache(self):
+        self._cache_epoch += 1
+        self._query_cache.clear()
 
     def _create_if_not_exists_sync(self):
         return self.database.create_collection("memories", get_or_create=True)
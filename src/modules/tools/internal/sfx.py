@@ -42,7 +42,8 @@ class SFXTool(BaseTool):
 
         self.sounds_path = pathlib.Path('assets/sounds')
         
-        self.registered_sounds = []
+        # shares the schema's enum list so registering only has to append
+        self.registered_sounds = SCHEMA["properties"]["sound_name"]["enum"]
 
         self.is_playing = asyncio.Lock()
 
@@ -57,12 +58,10 @@ class SFXTool(BaseTool):
     def register_sound(self, name: str):
         print(f'registered sound {name}')
         self.registered_sounds.append(name)
-        SCHEMA["properties"]["sound_name"]["enum"] = self.registered_sounds
-        
+
 
     def unregister_sound(self, name: str):
         self.registered_sounds.remove(name)
-        SCHEMA["properties"]["sound_name"]["enum"] = self.registered_sounds
 
     def _on_finish(self, _):
         self.is_playing.release()
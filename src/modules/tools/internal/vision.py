@@ -1,11 +1,33 @@
 # modules/tools/internal/discord/messaging.py
+import asyncio
 import base64
 from io import BytesIO
+import pathlib
 
 from services.llm_client import LLMClient
 from .base import BaseTool, tool
 from PIL import ImageGrab
 
+SCREENSHOT_MAX_SIZE = (1536, 1536)
+SCREENSHOT_QUALITY = 75
+
+
+def _grab_screenshot_base64() -> str:
+    """Grab, downscale and JPEG encode the screen, this is CPU heavy so run it off the event loop"""
+    screenshot = ImageGrab.grab()
+
+    # vision models downscale anyway, doing it first makes the encode a lot cheaper
+    screenshot.thumbnail(SCREENSHOT_MAX_SIZE)
+
+    buffered = BytesIO()
+    screenshot.save(buffered, format="JPEG", quality=SCREENSHOT_QUALITY, optimize=False)
+    jpeg = buffered.getvalue()
+
+    pathlib.Path('what_we_see.jpeg').write_bytes(jpeg)
+
+    return base64.b64encode(jpeg).decode("utf-8")
+
+
 class VisionTools(BaseTool):
     """Tools for Seeinng"""
     def __init__(self, config, **dependencies):
@@ -17,7 +39,8 @@ class VisionTools(BaseTool):
         if not self.brain_module:
             raise Exception('Vision tool requires brain_module dependency')
         
-        self.llm_client = LLMClient(config["llm"], config["tools"]["vision"]["model"])
+        self.llm_client: LLMClient = self.dependencies.get("llm_client") or LLMClient(config["llm"])
+        self.model = config["tools"]["vision"]["model"]
 
     @tool(
         name="screenshot_screen",
@@ -25,34 +48,26 @@ class VisionTools(BaseTool):
         parameters={}
     )
     async def analyse_screenshot(self):
-        screenshot = ImageGrab.grab()
-        screenshot.save('what_we_see.jpeg')
-
-        buffered = BytesIO()
-
-        # save the ss to the buffer
-        screenshot.save(buffered, format="JPEG")
-        base64_screenshot = base64.b64encode(buffered.getvalue()).decode("utf-8")
+        base64_screenshot = await asyncio.to_thread(_grab_screenshot_base64)
 
         try:
             assistant_message = ""
 
-            messages = map(lambda x: {"role": "user", "content": x["content"]}, self.brain_module.pending_conversation_buffer)
-            
             stream = self.llm_client.stream_completion(
               messages=[
                     {"role": "system", "content": "You are attempting to take the image recieved and describe it and answer the questions being asked about what you see and what you're currently looking at, the user messages are the previous conversation summary that led up to you being asked."},
-                    *messages,
+                    *self.brain_module.get_recent_user_messages(n=10),
                     {
                         "role": "user",
                         "content": [
                             {
                                 "type": "image_url",
-                                "image_url": { "url": f"data:image/png;base64,{base64_screenshot}" }
+                                "image_url": { "url": f"data:image/jpeg;base64,{base64_screenshot}" }
                             }
                         ]
                     }
-              ])
+              ],
+              model=self.model)
             
             async for chunk in stream:
                 if chunk["type"] == "text":
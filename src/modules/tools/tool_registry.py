@@ -1,12 +1,13 @@
 # modules/tools/tool_registry.py
 import logging
-from typing import Dict, Callable, Any, Optional
+from types import MappingProxyType
+from typing import Dict, Callable, Any, Mapping, Optional, Set
 from dataclasses import dataclass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ToolDefinition:
-    """Definition of a tool for LLM"""
+    """Definition of a tool for LLM, immutable once registered"""
 
     name: str
     description: str
@@ -23,6 +24,10 @@ class ToolRegistry:
 
     def __init__(self):
         self._tools: Dict[str, ToolDefinition] = {}
+        self._tools_view = MappingProxyType(self._tools)  # read-only, tracks _tools live
+        self._llm_defs_cache: Optional[list] = None  # rebuilt lazily after a registration
+        self._internal_names: Set[str] = set()
+        self._mcp_names: Set[str] = set()
         self.logger = logging.getLogger(__name__)
 
     def register_internal_tool(
@@ -33,6 +38,9 @@ class ToolRegistry:
             name=name, description=description, parameters=parameters, handler=handler
         )
         self._tools[name] = tool
+        self._internal_names.add(name)
+        self._mcp_names.discard(name)
+        self._llm_defs_cache = None
         self.logger.info(f"Registered internal tool: {name}")
 
     def register_mcp_tool(
@@ -46,14 +54,21 @@ class ToolRegistry:
             mcp_server=mcp_server,
         )
         self._tools[name] = tool
+        self._mcp_names.add(name)
+        self._internal_names.discard(name)
+        self._llm_defs_cache = None
         self.logger.info(f"Registered MCP tool: {name} (server: {mcp_server})")
 
     def get_tool(self, name: str) -> Optional[ToolDefinition]:
         """Get tool definition by name"""
         return self._tools.get(name)
 
-    def get_all_tools(self) -> Dict[str, ToolDefinition]:
-        """Get all registered tools"""
+    def get_all_tools(self) -> Mapping[str, ToolDefinition]:
+        """Get a read-only view of all registered tools"""
+        return self._tools_view
+
+    def get_all_tools_copy(self) -> Dict[str, ToolDefinition]:
+        """Get a mutable snapshot of all registered tools"""
         return self._tools.copy()
 
     def get_tool_definitions_for_llm(self) -> list:
@@ -61,12 +76,11 @@ class ToolRegistry:
         Get tool definitions in OpenAI format for LLM.
 
         Returns:
-            List of tool definitions compatible with OpenAI API
+            List of tool definitions compatible with OpenAI API, shared between
+            callers so it must not be mutated
         """
-        definitions = []
-
-        for tool in self._tools.values():
-            definitions.append(
+        if self._llm_defs_cache is None:
+            self._llm_defs_cache = [
                 {
                     "type": "function",
                     "function": {
@@ -75,16 +89,15 @@ class ToolRegistry:
                         "parameters": tool.parameters,
                     },
                 }
-            )
+                for tool in self._tools.values()
+            ]
 
-        return definitions
+        return self._llm_defs_cache
 
     def is_internal_tool(self, name: str) -> bool:
         """Check if tool is internal (has handler)"""
-        tool = self.get_tool(name)
-        return tool is not None and tool.handler is not None
+        return name in self._internal_names
 
     def is_mcp_tool(self, name: str) -> bool:
         """Check if tool is external MCP tool"""
-        tool = self.get_tool(name)
-        return tool is not None and tool.mcp_server is not None
+        return name in self._mcp_names
@@ -1,11 +1,15 @@
 # modules/tools/tools_module.py
 import asyncio
+from typing import Optional
 from modules.base import BaseModule
 from events import Event, EventType, event_handler
 from .tool_registry import ToolRegistry
 from .mcp_module import MCPModule
 from .internal import TOOL_CLASSES
 
+_MISSING = object()
+_ATTRS = ("text", "annotations", "meta")
+
 
 class ToolsModule(BaseModule):
     """Main tools orchestrator"""
@@ -23,6 +27,10 @@ class ToolsModule(BaseModule):
         self.module_dependencies = module_dependencies
         self.tool_instances = []
 
+        self._pending_tool_calls: list[Event] = []
+        self._drain_task: Optional[asyncio.Task] = None
+        self._stop_event = asyncio.Event()
+
         # MCP module for external tools
         self.mcp_module = MCPModule(
             event_bus=event_bus,
@@ -60,22 +68,22 @@ class ToolsModule(BaseModule):
         """
         Converts MCP content blocks into JSON-serializable dicts
         """
+        # leaves of big json payloads, nothing to probe
+        if content is None or isinstance(content, (str, int, float, bool, dict)):
+            return content
+
         if isinstance(content, list):
             return [self.normalize_mcp_content(c) for c in content]
 
-        # MCP TextContent
-        if hasattr(content, "type"):
-            data = {"type": content.type}
+        # MCP TextContent, one getattr per field instead of hasattr + access
+        content_type = getattr(content, "type", _MISSING)
+        if content_type is not _MISSING:
+            data = {"type": content_type}
 
-            # Pull common known fields safely
-            if hasattr(content, "text"):
-                data["text"] = content.text
-
-            if hasattr(content, "annotations") and content.annotations is not None:
-                data["annotations"] = content.annotations
-
-            if hasattr(content, "meta") and content.meta is not None:
-                data["meta"] = content.meta
+            for attr in _ATTRS:
+                value = getattr(content, attr, _MISSING)
+                if value is not _MISSING and value is not None:
+                    data[attr] = value
 
             return data
 
@@ -85,25 +93,58 @@ class ToolsModule(BaseModule):
 
     @event_handler(EventType.TOOL_CALL_REQUEST)
     async def handle_tool_call(self, event: Event):
-        """Handle tool calls"""
-        tool_name = event.data["name"]
-        tool_id = event.data["id"]
-        arguments = event.data["arguments"]
+        """Queue tool calls so ones requested in the same turn run together"""
+        self._pending_tool_calls.append(event)
+
+        if self._drain_task is None or self._drain_task.done():
+            self._drain_task = asyncio.create_task(self._drain_tool_calls())
 
-        self.logger.info(f"Tool call: {tool_name}")
+    async def _drain_tool_calls(self, delay: float = 0.005):
+        """Run every tool call that arrived within the drain window concurrently"""
+        while self._pending_tool_calls:
+            # give the rest of the llm's tool calls a moment to arrive
+            await asyncio.sleep(delay)
+
+            batch = self._pending_tool_calls
+            self._pending_tool_calls = []
+
+            # one bad call must not take the rest of the batch down with it
+            results = await asyncio.gather(
+                *(self._run_tool_call(event) for event in batch), return_exceptions=True
+            )
+
+            # emit in the order the calls were requested
+            for result in results:
+                if isinstance(result, BaseException):
+                    self.logger.error(f"Tool call crashed: {result}", exc_info=result)
+                elif result is not None:
+                    await self.event_bus.emit(result)
+
+    async def _run_tool_call(self, event: Event) -> Optional[Event]:
+        """Run a single tool call, returning the result (or error) event to emit"""
+        tool_name = None
+        tool_id = None
 
         try:
-            if self.tool_registry.is_internal_tool(tool_name):
+            tool_name = event.data["name"]
+            tool_id = event.data["id"]
+            arguments = event.data["arguments"]
+
+            self.logger.info(f"Tool call: {tool_name}")
+
+            tool_def = self.tool_registry.get_tool(tool_name)
+
+            if tool_def is None:
+                self.logger.warning(f"attempted to use unknown tool: {tool_name}")
+                # raise ValueError(f"Unknown tool: {tool_name}")
+                return None
+
+            if tool_def.handler is not None:
                 # Internal tool
-                tool_def = self.tool_registry.get_tool(tool_name)
-                if arguments != None:
-                    result = await tool_def.handler(**arguments)
-                else:
-                    result = await tool_def.handler()
+                result = await tool_def.handler(**(arguments or {}))
 
-            elif self.tool_registry.is_mcp_tool(tool_name):
+            elif tool_def.mcp_server is not None:
                 # MCP tool
-                tool_def = self.tool_registry.get_tool(tool_name)
                 result = await self.mcp_module.call_tool(
                     server_name=tool_def.mcp_server,
                     tool_name=tool_name,
@@ -112,30 +153,21 @@ class ToolsModule(BaseModule):
 
                 result = self.normalize_mcp_content(result)
             else:
-                self.logger.warning(f"attempted to use unknown tool: {tool_name}")
-                # raise ValueError(f"Unknown tool: {tool_name}")
-                return
-            
-            # Transform the results
-
+                self.logger.warning(f"tool {tool_name} has no handler or mcp server")
+                return None
 
-            # Emit result
-            await self.event_bus.emit(
-                Event(
-                    type=EventType.TOOL_RESULT,
-                    data={"id": tool_id, "name": tool_name, "result": result},
-                    source="tools",
-                )
+            return Event(
+                type=EventType.TOOL_RESULT,
+                data={"id": tool_id, "name": tool_name, "result": result},
+                source="tools",
             )
 
         except Exception as e:
             self.logger.error(f"Tool call failed: {e}", exc_info=True)
-            await self.event_bus.emit(
-                Event(
-                    type=EventType.TOOL_CALL_ERROR,
-                    data={"id": tool_id, "name": tool_name, "error": str(e)},
-                    source="tools",
-                )
+            return Event(
+                type=EventType.TOOL_CALL_ERROR,
+                data={"id": tool_id, "name": tool_name, "error": str(e)},
+                source="tools",
             )
 
     def get_tool_definitions_for_llm(self) -> list:
@@ -143,8 +175,15 @@ class ToolsModule(BaseModule):
         return self.tool_registry.get_tool_definitions_for_llm()
 
     async def _run(self):
-        while self._running:
-            await asyncio.sleep(1)
+        # nothing to do here, tool calls arrive through the event bus
+        await self._stop_event.wait()
 
     async def _cleanup(self):
+        self._stop_event.set()
+
+        # finish off any running tool batch before its mcp servers go away
+        if self._drain_task is not None:
+            self._drain_task.cancel()
+            await asyncio.gather(self._drain_task, return_exceptions=True)
+
         await self.mcp_module.stop()
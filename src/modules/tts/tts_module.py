@@ -1,6 +1,9 @@
 import asyncio
+import html
 import logging
-from queue import Empty, Queue
+from collections import OrderedDict, deque
+from typing import Callable
+import numpy as np
 from events import event_handler, EventType, Event
 from modules.base import BaseModule
 from azure.cognitiveservices.speech import (
@@ -12,6 +15,52 @@ from azure.cognitiveservices.speech import (
     SpeechSynthesisOutputFormat,
 )
 
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+MAX_COALESCED_FRAMES = 8  # most frames folded into one TTS_AUDIO_CHUNK event
+STOP_TIMEOUT = 2.0  # seconds to wait for azure to confirm a stopped synthesis
+MAX_UNCLAIMED_RESULTS = 8  # finished events kept around waiting for their generation
+_AUDIO_CHUNK_TYPE = EventType.TTS_AUDIO_CHUNK
+
+# matches SpeechSynthesisOutputFormat.Raw48Khz16BitMonoPcm below
+OUTPUT_SAMPLE_RATE = 48000
+OUTPUT_BYTES_PER_SAMPLE = 2
+OUTPUT_CHANNELS = 1
+
+
+def _mono_to_stereo_loop(mono: np.ndarray, out: np.ndarray) -> None:
+    # int16 in, int16 out, every sample goes to L and R
+    for i in range(mono.size):
+        out[2 * i] = mono[i]
+        out[2 * i + 1] = mono[i]
+
+
+# plain python would be far slower than numpy, so only use the loop when it gets jitted.
+# nogil lets azure's callback thread convert while the loop keeps running python
+mono_to_stereo = (
+    njit(cache=True, nogil=True)(_mono_to_stereo_loop) if njit else None
+)
+
+# stereo frames are recycled once _run has copied them into an event
+_STEREO_POOL: deque[bytearray] = deque(maxlen=128)
+
+
+def _acquire_stereo(size: int) -> bytearray:
+    # azure thread pops, the loop appends, both are atomic on a deque
+    try:
+        buf = _STEREO_POOL.pop()
+    except IndexError:
+        return bytearray(size)
+
+    return buf if len(buf) == size else bytearray(size)
+
+
+def _release_stereo(buf: bytearray) -> None:
+    _STEREO_POOL.append(buf)
+
 
 class PushAudioOutputStreamSampleCallback(audio.PushAudioOutputStreamCallback):
     """
@@ -19,13 +68,31 @@ class PushAudioOutputStreamSampleCallback(audio.PushAudioOutputStreamCallback):
     One instance == one TTS generation.
     """
 
-    def __init__(self, generation_id: int) -> None:
+    def __init__(
+        self,
+        generation_id: int,
+        loop: asyncio.AbstractEventLoop,
+        audio_queue: asyncio.Queue,
+        active_generation: Callable[[], int],
+        frame_bytes: int = 1920,
+    ) -> None:
         super().__init__()
         self.generation_id = generation_id
+        self._active_generation = active_generation
+        self._frame_bytes = frame_bytes
+
+        # azure calls write() from its own thread, frames are handed to the loop's queue
+        self._loop = loop
+        self.audio_queue = audio_queue
 
         self.logger = logging.getLogger(__name__)
-        self._frame_buffer = bytes()
-        self.audio_queue = Queue()
+
+        # fixed ring, capacity is a whole number of frames so a frame never straddles the wrap
+        self._ring_capacity = frame_bytes * 64
+        self._ring = bytearray(self._ring_capacity)
+        self._ring_view = memoryview(self._ring)
+        self._head = 0  # total bytes handed out as frames
+        self._tail = 0  # total bytes written by azure
         self._closed = False
 
         self.logger.info(
@@ -36,39 +103,114 @@ class PushAudioOutputStreamSampleCallback(audio.PushAudioOutputStreamCallback):
         if self._closed:
             return 0
 
-        self._frame_buffer += audio_buffer
+        # superseded already, ack so azure can wind down but skip the conversion
+        if self.generation_id != self._active_generation():
+            return audio_buffer.nbytes
+
+        # copy in whatever fits, draining full frames as we go so the ring never fills up
+        total = audio_buffer.nbytes
+        written = 0
+        while written < total:
+            tail = self._tail % self._ring_capacity
+            free = self._ring_capacity - (self._tail - self._head)
+            n = min(total - written, self._ring_capacity - tail, free)
+
+            self._ring_view[tail:tail + n] = audio_buffer[written:written + n]
+            self._tail += n
+            written += n
 
-        while len(self._frame_buffer) >= 1920:
-            mono = self._frame_buffer[:1920]
-            self._frame_buffer = self._frame_buffer[1920:]
+            self._drain_frames()
+
+        return total
+
+    def _drain_frames(self) -> None:
+        # runs on the writer's thread, so head and tail never race
+        while self._tail - self._head >= self._frame_bytes:
+            head = self._head % self._ring_capacity
+            mono = self._ring_view[head:head + self._frame_bytes]
+            self._head += self._frame_bytes
 
             stereo = self._convert_to_stereo(mono)
-            self.audio_queue.put((self.generation_id, stereo))
+            self._loop.call_soon_threadsafe(
+                self.audio_queue.put_nowait, (self.generation_id, stereo)
+            )
 
-        return audio_buffer.nbytes
+            mono.release()
 
-    def _convert_to_stereo(self, pcm: bytes) -> bytes:
-        stereo = bytearray(len(pcm) * 2)
-        j = 0
-        for i in range(0, len(pcm), 2):
-            sample = pcm[i:i + 2]
-            stereo[j:j + 2] = sample
-            stereo[j + 2:j + 4] = sample
-            j += 4
-        return bytes(stereo)
+    def _flush_remainder(self) -> None:
+        # whole samples only. head is frame aligned so the rest never wraps
+        remaining = (self._tail - self._head) & ~1
+        if remaining <= 0:
+            return
+
+        head = self._head % self._ring_capacity
+        mono = self._ring_view[head:head + remaining]
+        self._head = self._tail
+
+        stereo = self._convert_to_stereo(mono)
+        self._loop.call_soon_threadsafe(
+            self.audio_queue.put_nowait, (self.generation_id, stereo)
+        )
+
+        mono.release()
+
+    def _convert_to_stereo(self, pcm: bytes) -> bytearray:
+        # duplicate every s16le sample into L and R, straight into a pooled buffer
+        out = _acquire_stereo(len(pcm) * 2)
+
+        mono = np.frombuffer(pcm, dtype="<i2")
+        dst = np.frombuffer(out, dtype="<i2")
+
+        if mono_to_stereo is None:
+            # broadcast both channels in one pass over the output
+            dst.reshape(-1, 2)[:] = mono[:, None]
+        else:
+            mono_to_stereo(mono, dst)
+
+        return out
 
     def close(self) -> None:
         if self._closed:
             return
 
         self._closed = True
-        self.audio_queue.put((self.generation_id, None))
+
+        # the tail of the utterance is usually shorter than a frame, send it as a short one
+        if self.generation_id == self._active_generation():
+            self._flush_remainder()
+
+        self._loop.call_soon_threadsafe(
+            self.audio_queue.put_nowait, (self.generation_id, None)
+        )
 
         self.logger.info(
             "Audio callback closed for generation %d", self.generation_id
         )
 
 
+class RoutingAudioStreamCallback(audio.PushAudioOutputStreamCallback):
+    """
+    Long-lived push stream callback for the shared synthesizer.
+    Forwards audio to whichever generation's callback is currently attached.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.target: PushAudioOutputStreamSampleCallback | None = None
+
+    def write(self, audio_buffer: memoryview) -> int:
+        # read once, the loop can swap target between writes
+        target = self.target
+        if target is None:
+            return audio_buffer.nbytes
+
+        return target.write(audio_buffer)
+
+    def close(self) -> None:
+        # generations are closed individually, nothing to do for the shared stream
+        pass
+
+
 class TTSModule(BaseModule):
     def __init__(self, event_bus, module_manager, config=None):
         super().__init__('tts', event_bus, module_manager, config)
@@ -79,6 +221,9 @@ class TTSModule(BaseModule):
         self.tts_task = None
         self.loop = None
 
+        # every generation's frames land here, stale ones are dropped by generation id
+        self._audio_queue: asyncio.Queue = asyncio.Queue()
+
         self.speech_config = SpeechConfig(
             subscription=self.config["speech_key"],
             endpoint=self.config["speech_endpoint"],
@@ -90,6 +235,30 @@ class TTSModule(BaseModule):
 
         self.callback: PushAudioOutputStreamSampleCallback | None = None
 
+        # bigger frames mean fewer queue hops and events, discord still gets 20ms slices
+        frame_ms = self.config.get("frame_ms", 20)
+        if frame_ms <= 0 or frame_ms % 20:
+            raise ValueError(f"tts frame_ms must be a multiple of 20, got {frame_ms}")
+
+        self.frame_bytes = (
+            OUTPUT_SAMPLE_RATE * OUTPUT_BYTES_PER_SAMPLE * OUTPUT_CHANNELS * frame_ms // 1000
+        )
+
+        self._ssml_prefix = ""
+        self._ssml_suffix = ""
+
+        # one synthesizer for every utterance, built in _setup
+        self._router = RoutingAudioStreamCallback()
+        self.synthesizer: SpeechSynthesizer | None = None
+
+        # generation id -> future resolved by azure's completed/canceled events,
+        # which are matched back to a generation through the request's result id
+        self._synthesis_waiters: dict[int, asyncio.Future] = {}
+        self._synthesis_ids: dict[str, int] = {}
+
+        # finished events that beat their result id being recorded, few and short lived
+        self._unclaimed_results: OrderedDict[str, object] = OrderedDict()
+
         self.logger.info(
             "TTS module initialized with voice '%s'", self.config["voice"]
         )
@@ -113,7 +282,13 @@ class TTSModule(BaseModule):
             )
 
         old_callback = self.callback
-        self.callback = PushAudioOutputStreamSampleCallback(generation)
+        self.callback = PushAudioOutputStreamSampleCallback(
+            generation,
+            self.loop,
+            self._audio_queue,
+            lambda: self._tts_generation,
+            self.frame_bytes,
+        )
 
         if old_callback:
             old_callback.close()
@@ -125,43 +300,55 @@ class TTSModule(BaseModule):
             )
         )
 
-        self.tts_task = self.loop.run_in_executor(
-            None,
-            self._create_tts_stream,
-            generation,
-            text,
+        # azure signals completion through events, a thread only waits for the start
+        self.tts_task = asyncio.create_task(
+            self._create_tts_stream(generation, text, self.callback, self.tts_task)
         )
 
+    async def _create_tts_stream(
+        self,
+        generation: int,
+        text: str,
+        callback: PushAudioOutputStreamSampleCallback,
+        previous_task: asyncio.Task | None = None,
+    ):
+        waiter = None
+        result_id = None
+
+        try:
+            # the synthesizer is shared, let the previous utterance finish stopping first.
+            # wait() only watches it, cancelling us must not cancel its cleanup
+            if previous_task:
+                await asyncio.wait({previous_task})
 
-    def _create_tts_stream(self, generation: int, text: str):
-        self.logger.info("Starting TTS synthesis (gen=%d)", generation)
+            self.logger.info("Starting TTS synthesis (gen=%d)", generation)
 
-        callback = self.callback
-        synthesizer = None
+            waiter = self.loop.create_future()
+            self._synthesis_waiters[generation] = waiter
 
-        try:
-            stream = audio.PushAudioOutputStream(callback)
-            audio_config = audio.AudioOutputConfig(stream=stream)
+            self._router.target = callback
+
+            # llm output can contain <, > and & which would break the ssml
+            ssml = self._ssml_prefix + html.escape(text) + self._ssml_suffix
 
-            synthesizer = SpeechSynthesizer(
-                speech_config=self.speech_config,
-                audio_config=audio_config,
+            # resolves once azure starts this request, its result id is what the
+            # completed/canceled events carry
+            started = await asyncio.to_thread(
+                self.synthesizer.start_speaking_ssml_async(ssml).get
             )
+            result_id = started.result_id
 
-            ssml = f"""
-<speak version="1.0"
-       xmlns="http://www.w3.org/2001/10/synthesis"
-       xmlns:mstts="https://www.w3.org/2001/mstts"
-       xml:lang="en-US">
-    <voice name="{self.config["voice"]}">
-        <prosody pitch="25%">
-            {text}
-        </prosody>
-    </voice>
-</speak>
-"""
-
-            result = synthesizer.speak_ssml_async(ssml).get()
+            if started.reason == ResultReason.Canceled:
+                waiter.set_result(started)
+            else:
+                self._synthesis_ids[result_id] = generation
+
+                early = self._unclaimed_results.pop(result_id, None)
+                if early is not None:
+                    self._resolve_synthesis(early)
+
+            # shielded so a cancel leaves the waiter pending for the stop below
+            result = await asyncio.shield(waiter)
 
             if result.reason == ResultReason.SynthesizingAudioCompleted:
                 self.logger.info("TTS synthesis completed (gen=%d)", generation)
@@ -174,76 +361,166 @@ class TTSModule(BaseModule):
                 )
 
         except asyncio.CancelledError:
-            self.logger.info("TTS executor cancelled (gen=%d)", generation)
+            self.logger.info("TTS task cancelled (gen=%d)", generation)
 
         except Exception:
             self.logger.exception("Unhandled TTS error (gen=%d)", generation)
 
         finally:
-            # Stop Azure first to prevent late writes
-            if synthesizer:
+            if waiter is not None and not waiter.done():
+                # Stop Azure first to prevent late writes
                 try:
-                    synthesizer.stop_speaking_async().get()
+                    await asyncio.to_thread(
+                        lambda: self.synthesizer.stop_speaking_async().get()
+                    )
                 except Exception:
                     pass
 
+                # the canceled event is the last thing azure sends for this request,
+                # give it a moment so the finalize log reflects what azure did
+                if result_id is not None:
+                    await asyncio.wait({waiter}, timeout=STOP_TIMEOUT)
+
+            # a late event for this request no longer maps to anyone and is dropped
+            self._synthesis_waiters.pop(generation, None)
+            if result_id is not None:
+                self._synthesis_ids.pop(result_id, None)
+
+            if self._router.target is callback:
+                self._router.target = None
+
             # Only close if this is still the active generation
-            if callback and callback is self.callback:
+            if callback is self.callback:
                 callback.close()
 
             self.logger.info("TTS stream finalized (gen=%d)", generation)
 
+    def _on_synthesis_finished(self, evt):
+        # fired from azure's thread for both completed and canceled
+        self.loop.call_soon_threadsafe(self._resolve_synthesis, evt.result)
+
+    def _resolve_synthesis(self, result):
+        generation = self._synthesis_ids.pop(result.result_id, None)
+        if generation is None:
+            # short utterances can finish before the start future handed us the id
+            self._unclaimed_results[result.result_id] = result
+            if len(self._unclaimed_results) > MAX_UNCLAIMED_RESULTS:
+                self._unclaimed_results.popitem(last=False)
+            return
+
+        waiter = self._synthesis_waiters.get(generation)
+        if waiter and not waiter.done():
+            waiter.set_result(result)
+
     async def _run(self):
         self.logger.info("TTS run loop started")
 
         while self._running:
-            callback = self.callback
-            if not callback:
-                await asyncio.sleep(0)
+            generation_id, chunk = await self._audio_queue.get()
+
+            # Drop stale audio
+            if generation_id != self._tts_generation:
+                if chunk is not None:
+                    _release_stereo(chunk)
                 continue
 
-            try:
-                generation_id, chunk = await asyncio.to_thread(
-                    callback.audio_queue.get, False
-                )
+            exhausted = chunk is None
+            chunks = [] if exhausted else [chunk]
 
-                # Drop stale audio
-                if generation_id != self._tts_generation:
+            # fold whatever else is already queued into the same event
+            while not exhausted and len(chunks) < MAX_COALESCED_FRAMES:
+                try:
+                    extra_generation_id, extra = self._audio_queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+
+                if extra_generation_id != generation_id:
+                    if extra is not None:
+                        _release_stereo(extra)
                     continue
 
-                if chunk is None:
-                    self.logger.info("TTS exhausted (gen=%d)", generation_id)
-                    await self.event_bus.emit(
-                        Event(
-                            EventType.TTS_EXHAUSTED,
-                            data={"generation_id": generation_id},
-                        )
-                    )
+                if extra is None:
+                    exhausted = True
+                else:
+                    chunks.append(extra)
 
-                    continue
+            if chunks:
+                audio_bytes = b"".join(chunks)
+
+                # join copied them, the frames can go back to the pool
+                for frame in chunks:
+                    _release_stereo(frame)
 
                 await self.event_bus.emit(
                     Event(
-                        EventType.TTS_AUDIO_CHUNK,
+                        _AUDIO_CHUNK_TYPE,
                         data={
                             "generation_id": generation_id,
-                            "audio": chunk,
+                            "audio": audio_bytes,
                         },
                     )
                 )
 
-            except Empty:
-                continue
+            if exhausted:
+                self.logger.info("TTS exhausted (gen=%d)", generation_id)
+                await self.event_bus.emit(
+                    Event(
+                        EventType.TTS_EXHAUSTED,
+                        data={"generation_id": generation_id},
+                    )
+                )
+
 
     async def _cleanup(self):
         self.logger.info("Cleaning up TTS module")
 
         self._running = False
 
+        if self.tts_task and not self.tts_task.done():
+            self.tts_task.cancel()
+            await asyncio.gather(self.tts_task, return_exceptions=True)
+
         if self.callback:
             self.callback.close()
             self.callback = None
 
+        self._router.target = None
+        self.synthesizer = None
+
+        self._synthesis_ids.clear()
+        self._unclaimed_results.clear()
+
+    def _prewarm_stereo(self):
+        # compile (or load from cache) the kernel now, not on the first frame of the first reply
+        if mono_to_stereo is None:
+            return
+
+        mono = np.zeros(self.frame_bytes // 2, dtype="<i2")
+        mono_to_stereo(mono, np.empty(mono.size * 2, dtype="<i2"))
+
     async def _setup(self):
-        self.loop = asyncio.get_event_loop()
+        self.loop = asyncio.get_running_loop()
+
+        await asyncio.to_thread(self._prewarm_stereo)
+
+        # the wrapper never changes, only the text inside it does
+        self._ssml_prefix = (
+            '<speak version="1.0"'
+            ' xmlns="http://www.w3.org/2001/10/synthesis"'
+            ' xmlns:mstts="https://www.w3.org/2001/mstts"'
+            ' xml:lang="en-US">'
+            f'<voice name="{html.escape(self.config["voice"])}">'
+            '<prosody pitch="25%">'
+        )
+        self._ssml_suffix = "</prosody></voice></speak>"
+
+        # built once so each utterance skips native handle and connection setup
+        stream = audio.PushAudioOutputStream(self._router)
+        self.synthesizer = SpeechSynthesizer(
+            speech_config=self.speech_config,
+            audio_config=audio.AudioOutputConfig(stream=stream),
+        )
+        self.synthesizer.synthesis_completed.connect(self._on_synthesis_finished)
+        self.synthesizer.synthesis_canceled.connect(self._on_synthesis_finished)
+
         self.logger.info("TTS module setup complete")
@@ -11,6 +11,7 @@ from modules.base import BaseModule
 from utils.pcm_audio import DiscordAudioProcessor
 
 DISCORD_FRAME_BYTES = 3840  # 20ms @ 48kHz stereo s16le
+_SENT_RE = re.compile(r"[.!?]+\s+")  # end of a sentence plus the whitespace after it
 
 
 class TTSModule(BaseModule):
@@ -18,7 +19,7 @@ class TTSModule(BaseModule):
         super().__init__("tts", event_bus, module_manager, config)
 
         self.text_buffer = ""
-        self.sentence_pattern = re.compile(r"[.!?]+\s+")
+        self._scan_pos = 0  # where the next sentence search starts in text_buffer
 
         self.engine = None
         self.stream = None
@@ -34,7 +35,7 @@ class TTSModule(BaseModule):
     # ---------------- SETUP ---------------- #
 
     async def _setup(self):
-        self._event_loop = asyncio.get_event_loop()
+        self._event_loop = asyncio.get_running_loop()
 
         speech_key = self.config.get("azure_speech_key")
         speech_region = self.config.get("azure_speech_region")
@@ -59,21 +60,28 @@ class TTSModule(BaseModule):
     @event_handler(EventType.LLM_TEXT_CHUNK)
     async def on_text_chunk(self, event: Event):
         self.text_buffer += event.data.get("text", "")
+        buffer = self.text_buffer
 
-        sentences = self.sentence_pattern.split(self.text_buffer)
-        if len(sentences) > 1:
-            for sentence in sentences[:-1]:
-                sentence = sentence.strip()
-                if sentence:
-                    await self._queue_sentence(sentence)
+        # only search the text we haven't already looked at
+        last_end = 0
+        for match in _SENT_RE.finditer(buffer, self._scan_pos):
+            sentence = buffer[last_end:match.start()].strip()
+            if sentence:
+                await self._queue_sentence(sentence)
 
-            self.text_buffer = sentences[-1]
+            last_end = match.end()
+
+        self.text_buffer = buffer[last_end:]
+
+        # trailing punctuation might still be waiting on the whitespace that ends the sentence
+        self._scan_pos = len(self.text_buffer.rstrip(".!?"))
 
     @event_handler(EventType.LLM_GENERATION_COMPLETE)
     async def on_generation_complete(self, event: Event):
         if self.text_buffer.strip():
             await self._queue_sentence(self.text_buffer.strip())
             self.text_buffer = ""
+            self._scan_pos = 0
 
     async def _queue_sentence(self, text: str):
         was_empty = self._synthesis_queue.empty() and not self._is_synthesizing
@@ -93,6 +101,7 @@ class TTSModule(BaseModule):
         self.logger.info("🛑 TTS interrupted")
 
         self.text_buffer = ""
+        self._scan_pos = 0
         self._audio_processor.reset()
 
         while not self._synthesis_queue.empty():
@@ -121,19 +130,20 @@ class TTSModule(BaseModule):
 
     async def _synthesis_worker(self):
         while self._running:
-            try:
-                text = await asyncio.wait_for(self._synthesis_queue.get(), timeout=0.1)
-                await self._synthesize_text(text)
+            text = await self._synthesis_queue.get()
+
+            # None is put on the queue by _cleanup to wake us up for shutdown
+            if text is None:
+                break
 
-                if self._synthesis_queue.empty() and self._is_speaking:
-                    self._is_speaking = False
-                    await self.event_bus.emit(Event(
-                        type=EventType.TTS_COMPLETE,
-                        source="tts"
-                    ))
+            await self._synthesize_text(text)
 
-            except asyncio.TimeoutError:
-                continue
+            if self._synthesis_queue.empty() and self._is_speaking:
+                self._is_speaking = False
+                await self.event_bus.emit(Event(
+                    type=EventType.TTS_COMPLETE,
+                    source="tts"
+                ))
 
     async def _synthesize_text(self, text: str):
         if self._is_synthesizing:
@@ -141,8 +151,8 @@ class TTSModule(BaseModule):
 
         self._is_synthesizing = True
         try:
-            loop = asyncio.get_event_loop()
-            await loop.run_in_executor(None, self._blocking_synthesis, text)
+            # loop cached in _setup, run_in_executor skips the context copy to_thread does
+            await self._event_loop.run_in_executor(None, self._blocking_synthesis, text)
         finally:
             self._is_synthesizing = False
 
@@ -181,6 +191,7 @@ class TTSModule(BaseModule):
 
     async def _cleanup(self):
         self._running = False
+        await self._synthesis_queue.put(None)
         self._audio_processor.reset()
 
         if self._synthesis_worker_task:
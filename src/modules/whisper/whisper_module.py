@@ -13,7 +13,11 @@ from utils.audio_debug import save_audio_for_debugging
 
 logger = logging.getLogger(__name__)
 
-RESAMPLER = torchaudio.transforms.Resample(orig_freq=48_000, new_freq=16_000)
+DEVICE = "cuda"
+SHORT_CLIP_SAMPLES = 16_000 * 2  # under 2s at whisper's 16kHz
+
+# lives next to the model so preprocessing doesnt bounce through the cpu
+RESAMPLER = torchaudio.transforms.Resample(orig_freq=48_000, new_freq=16_000).to(DEVICE)
 
 
 class WhisperModule(BaseModule):
@@ -24,32 +28,24 @@ class WhisperModule(BaseModule):
 
         self._model = WhisperModel(
             model_size_or_path=config.get("model", "distil-large-v3"),
-            device="cuda",
+            device=DEVICE,
             compute_type="float16",
             num_workers=config.get("num_workers", 5),
         )
 
-        self._executor = ThreadPoolExecutor(max_workers=config.get("num_workers", 5))
+        # one gpu, so one transcription at a time. num_workers above are ctranslate2's own threads
+        self._executor = ThreadPoolExecutor(max_workers=1)
 
     @event_handler(EventType.TRANSCRIPTION_REQUEST)
     async def on_transcription_request(self, event: Event):
         await self._stt_queue.put(event.data)
 
     async def _run(self):
-        tasks = []
-        try:
-            while self._running:
-                job = await self._stt_queue.get()
-                task = asyncio.create_task(self._transcribe_job(job))
-                tasks.append(task)
-
-                # Clean up completed tasks
-                tasks = [t for t in tasks if not t.done()]
-        except asyncio.CancelledError:
-            # Wait for pending transcriptions
-            if tasks:
-                await asyncio.gather(*tasks, return_exceptions=True)
-            raise
+        while self._running:
+            job = await self._stt_queue.get()
+
+            # the executor is serial anyway, so just finish each job before the next
+            await self._transcribe_job(job)
 
     async def _transcribe_job(self, job):
         try:
@@ -73,12 +69,34 @@ class WhisperModule(BaseModule):
             segments = await loop.run_in_executor(
                 self._executor, self._blocking_transcribe, audio_data
             )
-                        
-            text = " ".join(
-                segment.text
-                for segment in segments
-                if segment.no_speech_prob < 0.4  # More lenient threshold
-            ).strip()
+
+            # segments decode lazily, pull them one at a time so partials go out early
+            texts = []
+            while True:
+                segment = await loop.run_in_executor(
+                    self._executor, next, segments, None
+                )
+                if segment is None:
+                    break
+
+                if segment.no_speech_prob >= 0.4:  # More lenient threshold
+                    continue
+
+                texts.append(segment.text)
+
+                await self.event_bus.emit(
+                    Event(
+                        type=EventType.TRANSCRIPTION_PARTIAL,
+                        data={
+                            "user_name": user_name,
+                            "user_id": job.get("user_id"),
+                            "transcription": segment.text.strip(),
+                        },
+                        source="whisper",
+                    )
+                )
+
+            text = " ".join(texts).strip()
 
             if not text:
                 logger.debug(f"No speech detected for {user_name}")
@@ -103,49 +121,62 @@ class WhisperModule(BaseModule):
 
     def _pcm48k_to_whisper(self, audio_bytes: bytes) -> np.ndarray:
         # Discord sends stereo interleaved: LRLRLRLR...
-        audio = np.frombuffer(audio_bytes, dtype=np.int16)
-
-        # Reshape to (frames, 2) for stereo
-        audio = audio.reshape(-1, 2)
-
-        # Convert to mono by averaging channels
-        audio = audio.mean(axis=1)
-
-        # Normalize to float32 [-1, 1]
-        audio = audio.astype(np.float32) / 32768.0
+        # one upload, then downmix + normalize to float32 [-1, 1] + resample on the gpu
+        audio = (
+            torch.frombuffer(audio_bytes, dtype=torch.int16)
+            .to(DEVICE, non_blocking=True)
+            .view(-1, 2)
+            .to(torch.float32)
+            .mean(dim=1)
+            .mul_(1 / 32768.0)
+        )
 
         # Resample 48kHz → 16kHz
-        audio_tensor = torch.from_numpy(audio)
-        audio_resampled = RESAMPLER(audio_tensor)
+        audio_resampled = RESAMPLER(audio)
 
-        return audio_resampled.numpy()
+        # faster-whisper wants a numpy array, so only come back to the cpu at the end
+        return audio_resampled.cpu().numpy()
 
     def _blocking_transcribe(self, audio_data: bytes):
         if len(audio_data) < 3200:  # Less than ~0.1s of audio
             logger.warning("Audio too short, skipping")
-            return []
+            return iter(())
 
         audio = self._pcm48k_to_whisper(audio_data)
 
+        # greedy is as good as beam search on short clips and a lot cheaper
+        beam_size = 1 if audio.shape[0] < SHORT_CLIP_SAMPLES else 5
+
         logger.debug("attempting to transcribe audio data")
 
         segments, _ = self._model.transcribe(
             audio,
             language="en",
             vad_filter=True,  # you already did VAD
-            beam_size=5,
-            # condition_on_previous_text=False,
+            beam_size=beam_size,
             # initial_prompt=(
             #     "The following conversation mentions a character named Kleeborp. "
             #     "Kleeborp is spelled K-L-E-E-B-O-R-P."
             # ),
         )
 
-        self.logger.info(f"audio transcribed {segments}")
+        # lazy, the actual decoding happens as the caller iterates
+        return iter(segments)
 
-        return list(segments)
+    def _prewarm(self):
+        # first calls pay for cuda kernel setup, get that out of the way before anyone talks
+        RESAMPLER(torch.zeros(48_000, device=DEVICE))
+
+        segments, _ = self._model.transcribe(
+            np.zeros(16_000, dtype=np.float32), language="en"
+        )
+        list(segments)
 
     async def _setup(self):
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self._prewarm)
+        logger.info("Whisper model and resampler warmed up")
+
         return await super()._setup()
 
     async def _cleanup(self):
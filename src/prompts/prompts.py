@@ -1,7 +1,12 @@
-from email import charset
+from functools import lru_cache
 import logging
 import os
 
+try:
+    from charset_normalizer import from_bytes
+except ImportError:
+    from_bytes = None
+
 logger = logging.getLogger()
 
 current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -24,28 +29,33 @@ def _load_prompt_from_file(file_path: str):
             continue
 
     # If all common encodings fail, try to detect encoding
-    try:
-        with open(file_path, "rb") as file:
-            raw_data = file.read()
-        detected = charset.detect(raw_data)
-        detected_encoding = detected["encoding"]
-
-        if detected_encoding:
-            try:
-                return raw_data.decode(detected_encoding)
-            except UnicodeDecodeError:
-                pass
-    except Exception as e:
-        logger.error(f"Error detecting encoding for {file_path}: {e}")
+    if from_bytes is not None:
+        try:
+            with open(file_path, "rb") as file:
+                raw_data = file.read()
+            best = from_bytes(raw_data).best()
+
+            if best is not None:
+                return str(best)
+        except Exception as e:
+            logger.error(f"Error detecting encoding for {file_path}: {e}")
 
     raise UnicodeError(f"Failed to decode {file_path} with any encoding")
 
 
+@lru_cache(maxsize=None)
 def load_prompt(prompt_name: str) -> str:
-    """Load the content of a specific utility prompt file."""
+    """Load the content of a specific utility prompt file, read once per process."""
     util_file_path = os.path.join(UTIL_PROMPT_DIR, f"{prompt_name}.txt")
     try:
         return _load_prompt_from_file(util_file_path)
     except Exception as e:
         logger.error(f"Error loading util {prompt_name}: {e}")
         raise
+
+
+def preload_prompts():
+    """Warm the cache with every prompt in the texts directory"""
+    for file_name in os.listdir(UTIL_PROMPT_DIR):
+        if file_name.endswith(".txt"):
+            load_prompt(file_name[:-4])
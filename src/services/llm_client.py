@@ -1,8 +1,10 @@
 # services/llm_client.py
 import logging
-from openai import AsyncOpenAI
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from typing import AsyncIterator, Dict, Any, Optional
 import json
+from utils import fast_json
 
 logger = logging.getLogger(__name__)
 
@@ -15,17 +17,36 @@ class LLMClient:
         self.client = AsyncOpenAI(
             api_key=config["api_key"],
             base_url=config.get("base_url"),  # None for OpenAI, set for OpenRouter
+            # shared between modules, so keep plenty of connections alive for reuse
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32)
+            ),
         )
 
         self.model = model_override or config.get("model", "gpt-4-turbo-preview")
         print(self.model)
 
+        # sampling settings dont change at runtime, read them once.
+        # tempurate is the old misspelt key, still honoured so existing configs keep working
+        self.top_p = config.get("top_p", 0.8)
+        self.temperature = config.get("temperature", config.get("tempurate", 0.75))
+        self.max_tokens = config.get("max_tokens", 300)
+        self.frequency_penalty = config.get("frequency_penalty", 0.8)
+        self.presence_penalty = config.get("presence_penalty", 0.3)
+
     async def stream_completion(
-        self, messages: list, tools: Optional[list] = None, tool_choice: str = "auto"
+        self,
+        messages: list,
+        tools: Optional[list] = None,
+        tool_choice: str = "auto",
+        model: Optional[str] = None,
     ) -> AsyncIterator[Dict[str, Any]]:
         """
         Stream completion and yield structured chunks.
 
+        Args:
+            model: Overrides the client's model for this call only
+
         Yields:
             {
                 'type': 'text' | 'tool_call' | 'done',
@@ -36,21 +57,22 @@ class LLMClient:
         """
         try:
             stream = await self.client.chat.completions.create(
-                model=self.model,
+                model=model or self.model,
                 messages=messages,
                 tools=tools,
                 tool_choice=tool_choice if tools else "none",
                 stream=True,
                 stream_options={"include_usage": True},
-                top_p=self.config.get('top_p', 0.8),
-                temperature=self.config.get('tempurate', 0.75),
-                max_tokens=self.config.get('max_tokens', 300),
-                frequency_penalty=self.config.get('frequency_penalty', 0.8),
-                presence_penalty=self.config.get('presence_penalty', 0.3)
+                top_p=self.top_p,
+                temperature=self.temperature,
+                max_tokens=self.max_tokens,
+                frequency_penalty=self.frequency_penalty,
+                presence_penalty=self.presence_penalty,
             )
 
-            # Track tool calls being built
-            tool_calls_buffer = {}
+            # Track tool calls being built, indexed by tool_call.index
+            tool_calls_buffer: list = []
+            args_parts: list[list[str]] = []  # argument json arrives in pieces, join once at the end
 
             async for chunk in stream:
                 if not chunk.choices:
@@ -70,11 +92,15 @@ class LLMClient:
                         idx = tool_call.index
 
                         # Initialize buffer for this tool call
-                        if idx not in tool_calls_buffer:
+                        if idx >= len(tool_calls_buffer):
+                            missing = idx + 1 - len(tool_calls_buffer)
+                            tool_calls_buffer.extend([None] * missing)
+                            args_parts.extend([] for _ in range(missing))
+
+                        if tool_calls_buffer[idx] is None:
                             tool_calls_buffer[idx] = {
                                 "id": tool_call.id,
                                 "name": "",
-                                "arguments": "",
                             }
 
                         # Accumulate tool call data
@@ -82,31 +108,33 @@ class LLMClient:
                             tool_calls_buffer[idx]["name"] = tool_call.function.name
 
                         if tool_call.function.arguments:
-                            tool_calls_buffer[idx]["arguments"] += (
-                                tool_call.function.arguments
-                            )
+                            args_parts[idx].append(tool_call.function.arguments)
 
                 # When stream finishes, yield complete tool calls
                 if finish_reason:
-                    if tool_calls_buffer:
-                        for tool_call in tool_calls_buffer.values():
-                            # Parse arguments JSON
-                            try:
-                                arguments = json.loads(tool_call["arguments"])
-                            except json.JSONDecodeError:
-                                logger.error(
-                                    f"Failed to parse tool arguments: {tool_call['arguments']}"
-                                )
-                                arguments = {}
-
-                            yield {
-                                "type": "tool_call",
-                                "tool_call": {
-                                    "id": tool_call["id"],
-                                    "name": tool_call["name"],
-                                    "arguments": arguments,
-                                },
-                            }
+                    for tool_call, parts in zip(tool_calls_buffer, args_parts):
+                        if tool_call is None:
+                            continue
+
+                        raw_arguments = "".join(parts)
+
+                        # Parse arguments JSON, orjson's decode error subclasses json's
+                        try:
+                            arguments = fast_json.loads(raw_arguments)
+                        except json.JSONDecodeError:
+                            logger.error(
+                                f"Failed to parse tool arguments: {raw_arguments}"
+                            )
+                            arguments = {}
+
+                        yield {
+                            "type": "tool_call",
+                            "tool_call": {
+                                "id": tool_call["id"],
+                                "name": tool_call["name"],
+                                "arguments": arguments,
+                            },
+                        }
 
                     yield {"type": "done", "finish_reason": finish_reason}
 
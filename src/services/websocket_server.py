@@ -1,6 +1,5 @@
 # services/websocket_server.py
 import asyncio
-import json
 import logging
 from typing import Set
 from core.event_bus import Event, EventBus
@@ -8,9 +7,18 @@ from core.module_manager import ModuleManager
 import websockets
 
 from modules.games.game_module import GameModule
+from utils import fast_json
 
 logger = logging.getLogger(__name__)
 
+# specific commands for the game module
+GAME_COMMANDS = frozenset(
+    ("startup", "context", "actions/force", "actions/register", "actions/unregister", "action/result")
+)
+
+# payload never changes, no need to serialize it per message
+_ACK = fast_json.dumps({"type": "ack", "success": True})
+
 class WebSocketServer:
     def __init__(
         self,
@@ -25,14 +33,19 @@ class WebSocketServer:
         self.port = port
         self._clients: Set[websockets.WebSocketServerProtocol] = set()
 
-        self.stop = None
-        
+        self._server = None
+
         self.game_module: GameModule | None = None
 
+        self._handlers = {
+            "ping": self._handle_ping,
+            "get_state": self._handle_get_state,
+            "emit_event": self._handle_emit_event,
+        }
+
     async def start(self):
         logger.info(f"Starting WebSocket server on {self.host}:{self.port}")
         self.game_module = self.module_manager.get_module('game')
-        self.stop = asyncio.get_running_loop().create_future()
 
         self._server = await websockets.serve(
             self._handle_client,
@@ -40,7 +53,8 @@ class WebSocketServer:
             self.port,
         )
 
-        await self.stop# Run forever
+        # ends once shutdown() closes the server
+        await self._server.serve_forever()
 
     async def _handle_client(self, websocket):
         """Handle individual client connection"""
@@ -54,63 +68,66 @@ class WebSocketServer:
         except websockets.exceptions.ConnectionClosed:
             logger.info(f"Client disconnected: {websocket.remote_address}")
         finally:
-            self._clients.remove(websocket)
+            # broadcast may have pruned it already
+            self._clients.discard(websocket)
 
     async def _process_message(self, websocket, message: str):
         """Process incoming WebSocket message"""
         try:
-            data = json.loads(message)
+            data = fast_json.loads(message)
             command = data.get("command")
-            
-            # specific commands for the game module
-            game_commands = ["startup", "context", "actions/force", "actions/register", "actions/unregister", "action/result"]
 
-            match command:
-                  case "ping":
-                      await websocket.send(json.dumps({"type": "ack", "success": True}))
+            handler = self._handlers.get(command)
+            if handler:
+                await handler(websocket, data)
+            elif command in GAME_COMMANDS:
+                await self.game_module.handle_incoming_command(command, data)
+            else:
+                logger.warning(f'unknown incoming command from websocket {command}')
 
-                  case "get_state":
-                      state = self.module_manager.get_all_state()
-                      await websocket.send(json.dumps({"type": "state", "data": state}))
-
-                  case "emit_event":
-                      event = Event(
-                          type=data["event_type"],
-                          data=data.get("event_data"),
-                          source="websocket",
-                      )
+        except Exception as e:
+            logger.error(f"Error processing message: {e}", exc_info=True)
+            await websocket.send(fast_json.dumps({"type": "error", "message": str(e)}), text=True)
 
-                      await self.event_bus.emit(event)
+    async def _handle_ping(self, websocket, data: dict):
+        await websocket.send(_ACK, text=True)
 
-                      await websocket.send(json.dumps({"type": "ack", "success": True}))
+    async def _handle_get_state(self, websocket, data: dict):
+        state = self.module_manager.get_all_state()
+        await websocket.send(fast_json.dumps({"type": "state", "data": state}), text=True)
 
-                  case _:
-                      if command in game_commands:
-                          # Handle memory management
-                          await self.game_module.handle_incoming_command(command, data)
-                      else:
-                          logger.warning(f'unknown incoming command from websocket {command}')
+    async def _handle_emit_event(self, websocket, data: dict):
+        event = Event(
+            type=data["event_type"],
+            data=data.get("event_data"),
+            source="websocket",
+        )
 
+        await self.event_bus.emit(event)
 
-        except Exception as e:
-            logger.error(f"Error processing message: {e}", exc_info=True)
-            await websocket.send(json.dumps({"type": "error", "message": str(e)}))
+        await websocket.send(_ACK, text=True)
 
     async def broadcast(self, message: dict):
         """Broadcast message to all connected clients"""
         if self._clients:
-            await asyncio.gather(
-                *[client.send(json.dumps(message, default=None)) for client in self._clients],
+            # same payload for everyone, serialize it once.
+            # text=True keeps it a text frame even though it's already utf-8 bytes
+            payload = fast_json.dumps(message)
+
+            clients = list(self._clients)
+            results = await asyncio.gather(
+                *[client.send(payload, text=True) for client in clients],
                 return_exceptions=True,
             )
 
+            # dont keep fanning out to sockets that are already gone
+            for client, result in zip(clients, results):
+                if isinstance(result, websockets.exceptions.ConnectionClosed):
+                    self._clients.discard(client)
+
     async def shutdown(self):
         logger.info("Shutting down WebSocket server")
 
-        # Stop main wait
-        if self.stop and not self.stop.done():
-            self.stop.set_result(None)
-
         # Close all active clients (THIS IS CRITICAL)
         if self._clients:
             await asyncio.gather(
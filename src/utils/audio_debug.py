@@ -4,8 +4,26 @@ import soundfile as sf
 from pathlib import Path
 import logging
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
 logger = logging.getLogger(__name__)
 
+INT16_SCALE = 1.0 / 32768.0
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def i16_to_f32(src, dst):
+        # cast + scale in one pass over flat arrays
+        for i in prange(src.size):
+            dst[i] = src[i] * INT16_SCALE
+
+else:
+    i16_to_f32 = None
+
 
 def save_audio_for_debugging(
     audio_bytes: bytes,
@@ -26,12 +44,17 @@ def save_audio_for_debugging(
         # Convert bytes to int16 array
         audio = np.frombuffer(audio_bytes, dtype=np.int16)
 
+        # Normalize to float32, one pass either way
+        audio_float = np.empty(audio.size, dtype=np.float32)
+        if i16_to_f32 is not None:
+            i16_to_f32(audio, audio_float)
+        else:
+            np.multiply(audio, INT16_SCALE, out=audio_float, dtype=np.float32)
+
         # Reshape for stereo
         if channels == 2:
             audio = audio.reshape(-1, 2)
-
-        # Normalize to float32
-        audio_float = audio.astype(np.float32) / 32768.0
+            audio_float = audio_float.reshape(-1, 2)
 
         # Save as WAV
         sf.write(output_path, audio_float, sample_rate)
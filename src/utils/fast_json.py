@@ -0,0 +1,22 @@
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj) -> bytes:
+    """Serialize to utf-8 json bytes, orjson when it's installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+    return json.dumps(obj).encode()
+
+
+def loads(data: str | bytes):
+    """Parse json from str or bytes, orjson when it's installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+
+    return json.loads(data)
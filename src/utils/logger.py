@@ -1,10 +1,16 @@
 # utils/logger.py
+import atexit
 import logging
+import os
+import queue
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from typing import Optional
 
+_listener: Optional[QueueListener] = None
+
 
 def setup_logging(
     level: str = "INFO",
@@ -43,6 +49,13 @@ def setup_logging(
     # Remove existing handlers
     root_logger.handlers.clear()
 
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+    handlers = []
+
     # Console handler (with colors)
     kleeborp_filter = KleeborgLogFilter()
 
@@ -51,21 +64,28 @@ def setup_logging(
     console_handler.setFormatter(colored_formatter)
     console_handler.addFilter(kleeborp_filter)
 
-    root_logger.addHandler(console_handler)
+    handlers.append(console_handler)
 
     # File handler (if specified)
     if log_file:
         log_path = Path(log_file)
         log_path.parent.mkdir(parents=True, exist_ok=True)
 
-        file_handler = RotatingFileHandler(
+        file_handler = ByteCountingRotatingFileHandler(
             log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8"
         )
         file_handler.setLevel(numeric_level)
         file_handler.setFormatter(formatter)
         file_handler.addFilter(kleeborp_filter)
 
-        root_logger.addHandler(file_handler)
+        handlers.append(file_handler)
+
+    # the event loop only enqueues records, a background thread does the actual writes
+    log_queue = queue.Queue(-1)
+    root_logger.addHandler(QueueHandler(log_queue))
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
 
     # Silence noisy libraries
     logging.getLogger("discord").setLevel(logging.ERROR)
@@ -74,6 +94,112 @@ def setup_logging(
     root_logger.info(f"Logging initialized at {level} level")
 
 
+class ByteCountingRotatingFileHandler(RotatingFileHandler):
+    """
+    RotatingFileHandler that keeps count of what it wrote instead of
+    checking the file on every record, and formats each record once.
+    Rollover only swaps in a fresh file, shifting the backups happens on a
+    background thread.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # one worker, so backup shifts never overlap
+        self._rotation_executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="log-rotation"
+        )
+        self._rotation_seq = 0
+
+        # appending to an existing log, start from its real size
+        try:
+            self._bytes_written = os.path.getsize(self.baseFilename)
+        except OSError:
+            self._bytes_written = 0
+
+    def shouldRollover(self, record):
+        return 0 < self.maxBytes <= self._bytes_written
+
+    def doRollover(self):
+        if self.stream:
+            self.stream.close()
+            self.stream = None
+
+        # a rename is all the writer waits for, the full log is parked under a unique name
+        if self.backupCount > 0 and os.path.exists(self.baseFilename):
+            self._rotation_seq += 1
+            pending = f"{self.baseFilename}.rotating{self._rotation_seq}"
+            os.rename(self.baseFilename, pending)
+
+            try:
+                self._rotation_executor.submit(self._shift_backups, pending)
+            except RuntimeError:
+                # executors refuse work once the interpreter is shutting down, the
+                # listener can still be draining records then, so just do it inline
+                self._shift_backups(pending)
+
+        if not self.delay:
+            self.stream = self._open()
+
+        self._bytes_written = 0
+
+    def _shift_backups(self, pending: str):
+        """Runs on the rotation thread, same shuffle as RotatingFileHandler.doRollover"""
+        try:
+            for i in range(self.backupCount - 1, 0, -1):
+                sfn = self.rotation_filename(f"{self.baseFilename}.{i}")
+                dfn = self.rotation_filename(f"{self.baseFilename}.{i + 1}")
+                if os.path.exists(sfn):
+                    if os.path.exists(dfn):
+                        os.remove(dfn)
+                    os.rename(sfn, dfn)
+
+            dfn = self.rotation_filename(self.baseFilename + ".1")
+            if os.path.exists(dfn):
+                os.remove(dfn)
+            self.rotate(pending, dfn)
+        except OSError as e:
+            # logging about logging would just loop back here
+            print(f"Log rotation failed for {pending}: {e}", file=sys.stderr)
+
+    def close(self):
+        # let pending rotations land before the handler goes away
+        self._rotation_executor.shutdown(wait=True)
+        super().close()
+
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+
+            # same approximation as the stdlib, characters rather than encoded bytes
+            if self.maxBytes > 0 and self._bytes_written and (
+                self._bytes_written + len(msg) >= self.maxBytes
+            ):
+                self.doRollover()
+
+            if self.stream is None:
+                self.stream = self._open()
+
+            self.stream.write(msg)
+            self.flush()
+            self._bytes_written += len(msg)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+def _stop_listener():
+    """Flush whatever is still queued before the interpreter exits"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(_stop_listener)
+
+
 class KleeborgLogFilter(logging.Filter):
     """Only allow logs from Kleeborp modules"""
 
@@ -90,8 +216,8 @@ class KleeborgLogFilter(logging.Filter):
     )
 
     def filter(self, record):
-        # Allow if logger name starts with any allowed prefix
-        return any(record.name.startswith(prefix) for prefix in self.ALLOWED_PREFIXES)
+        # Allow if logger name starts with any allowed prefix, startswith takes the whole tuple
+        return record.name.startswith(self.ALLOWED_PREFIXES)
 
 
 class ColoredFormatter(logging.Formatter):
@@ -110,15 +236,21 @@ class ColoredFormatter(logging.Formatter):
     RESET = "\033[0m"
     BOLD = "\033[1m"
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        # levels never change, so build each colored name once
+        self._colored = {
+            level: f"{color}{self.BOLD}{level:8s}{self.RESET}"
+            for level, color in self.COLORS.items()
+        }
+
     def format(self, record):
         # Save original levelname
         levelname = record.levelname
 
         # Add color to levelname
-        if levelname in self.COLORS:
-            record.levelname = (
-                f"{self.COLORS[levelname]}{self.BOLD}{levelname:8s}{self.RESET}"
-            )
+        record.levelname = self._colored.get(levelname, levelname)
 
         # Format the message
         result = super().format(record)
@@ -1,28 +1,50 @@
+from collections import deque
+import struct
 import discord
-import queue
 import numpy as np
 
 FRAME_SIZE = 3840  # 20ms of 48kHz stereo s16le
 
 class StreamingPCMSource(discord.AudioSource):
     def __init__(self):
-        self.queue = queue.Queue()
+        # one writer, discord's player thread as the one reader, deque append/popleft are atomic
+        self.queue: deque[bytes] = deque()
+        self._pending = bytearray()  # leftover that doesn't make a full frame yet
         self.eof = False
         self.closed = False
 
     def write(self, pcm: bytes):
-        if not self.closed:
-            self.queue.put(pcm)
+        if self.closed:
+            return
+
+        # producers hand over partial or several frames at once, discord reads exactly one per call
+        self._pending.extend(pcm)
+
+        full = len(self._pending) - len(self._pending) % FRAME_SIZE
+        if not full:
+            return
+
+        with memoryview(self._pending) as view:
+            for start in range(0, full, FRAME_SIZE):
+                self.queue.append(bytes(view[start:start + FRAME_SIZE]))
+
+        del self._pending[:full]
 
     def mark_eof(self):
+        # pad out the last partial frame so the tail of the audio still plays
+        if self._pending:
+            self._pending.extend(bytes(FRAME_SIZE - len(self._pending)))
+            self.queue.append(bytes(self._pending))
+            self._pending.clear()
+
         self.eof = True
 
     def close(self):
         self.closed = True
 
     def reset(self):
-        while not self.queue.empty():
-            self.queue.get_nowait()
+        self.queue.clear()
+        self._pending.clear()
 
         self.eof = False
         self.closed = False
@@ -32,9 +54,8 @@ class StreamingPCMSource(discord.AudioSource):
             return b""
 
         try:
-            return self.queue.get_nowait()
-        except queue.Empty:
-            print("queue is empty: eof: ", self.eof)
+            return self.queue.popleft()
+        except IndexError:
             if self.eof:
                 return b""  # triggers discord after-callback
 
@@ -47,11 +68,13 @@ DISCORD_FRAME_BYTES = 3840  # 20ms @ 48kHz stereo s16le
 class DiscordAudioProcessor:
     def __init__(self):
         self._buffer = bytearray()
+        self._head = 0  # start of the unread part of _buffer
         self._header_parsed = False
         self._pcm_offset = 0
 
     def reset(self):
         self._buffer.clear()
+        self._head = 0
         self._header_parsed = False
         self._pcm_offset = 0
 
@@ -63,6 +86,14 @@ class DiscordAudioProcessor:
         if data[:4] != b"RIFF":
             return data  # already raw PCM
 
+        # plain pcm wavs put "data" straight after the fmt chunk, whose size sits at byte 16
+        if data[12:16] == b"fmt " and len(data) >= 20:
+            (fmt_size,) = struct.unpack_from("<I", data, 16)
+            idx = 20 + fmt_size
+
+            if data[idx:idx + 4] == b"data":
+                return data[idx + 8:]
+
         # Find "data" chunk
         idx = data.find(b"data")
         if idx == -1:
@@ -82,14 +113,29 @@ class DiscordAudioProcessor:
             self._header_parsed = True
 
         # ---- Mono → Stereo ----
+        # grow the buffer and broadcast both channels straight into the new tail,
+        # no repeat() array or tobytes() copy in between
         pcm = np.frombuffer(chunk, dtype=np.int16)
-        stereo = np.repeat(pcm, 2)
+        old_len = len(self._buffer)
+        self._buffer.extend(bytes(2 * pcm.nbytes))
 
-        self._buffer.extend(stereo.tobytes())
+        dst = np.frombuffer(self._buffer, dtype=np.int16, offset=old_len).reshape(-1, 2)
+        dst[:] = pcm[:, None]
+        del dst  # drop the export, the bytearray cant be resized while numpy holds it
 
         # ---- Emit exact Discord frames ----
-        while len(self._buffer) >= DISCORD_FRAME_BYTES:
-            frames.append(bytes(self._buffer[:DISCORD_FRAME_BYTES]))
-            del self._buffer[:DISCORD_FRAME_BYTES]
+        # advance a head index instead of shifting the tail down after every frame
+        with memoryview(self._buffer) as view:
+            while len(self._buffer) - self._head >= DISCORD_FRAME_BYTES:
+                frames.append(bytes(view[self._head:self._head + DISCORD_FRAME_BYTES]))
+                self._head += DISCORD_FRAME_BYTES
+
+        # compact once in a while, or for free when everything was consumed
+        if self._head == len(self._buffer):
+            self._buffer.clear()
+            self._head = 0
+        elif self._head > 64 * 1024:
+            del self._buffer[:self._head]
+            self._head = 0
 
         return frames
@@ -1,6 +1,8 @@
 USER_NAME_TO_NAME_MAP = {"Gobbo": "gobboo"}
 
+# discord user name -> display name, reversed so the first entry wins like the old scan did
+_REVERSE = {x: key for key, x in reversed(USER_NAME_TO_NAME_MAP.items())}
+
 
 def user_name_to_name(user_name: str):
-    result = [key for key, x in USER_NAME_TO_NAME_MAP.items() if x == user_name]
-    return result[0] if result else user_name
+    return _REVERSE.get(user_name, user_name)